@@ -1,11 +1,20 @@
 import streamlit as st
-import pandas as pd
+from collections import OrderedDict
+import copy
+from concurrent.futures import Future
 from datetime import datetime, date
 import hashlib
-import json
+import hmac
+from operator import itemgetter
+import queue
+import re
+import threading
+import time
+from urllib.parse import quote
 
-import gspread
-from google.oauth2.service_account import Credentials
+from mgadl_items import ITEMS, ITEM_IDS
+
+# gspread / google-auth는 첫 전송 때 import (첫 화면 로딩 단축)
 
 
 # =========================
@@ -13,103 +22,122 @@ from google.oauth2.service_account import Credentials
 # =========================
 st.set_page_config(page_title="MG-ADL 설문지 - Vestibular LAB", page_icon="🧠", layout="centered")
 
-APP_PASSWORD = st.secrets.get("APP_PASSWORD", "")  # 비번은 Secrets에서만 관리 (화면 힌트 없음)
 SHEET_ID = st.secrets.get("SHEET_ID", "")
 WORKSHEET_NAME = st.secrets.get("WORKSHEET_NAME", "responses")
 SALT = st.secrets.get("SALT", "")
 SA_INFO = st.secrets.get("GOOGLE_SERVICE_ACCOUNT", None)
+# 디버그용: 매 전송마다 헤더 확인 (true/1/yes/on만 켜짐, "false"/"0" 같은 문자열은 꺼짐)
+FORCE_HEADER_CHECK = str(st.secrets.get("FORCE_HEADER_CHECK", False)).strip().lower() in ("true", "1", "yes", "on")
+
+_SALT_B = SALT.encode("utf-8")
+_SEP = b"|"
+
+
+@st.cache_resource(show_spinner=False)
+def _app_pw_hash():
+    """
+    APP_PASSWORD 다이제스트 (없으면 None). 비번은 Secrets에서만 관리 (화면 힌트 없음).
+    rerun마다 다시 읽고 해싱하지 않도록 프로세스당 1회만 계산 -> 입력값 다이제스트와 상수 시간 비교.
+    """
+    pw = st.secrets.get("APP_PASSWORD", "")
+    return hashlib.blake2b(pw.encode("utf-8"), digest_size=16).digest() if pw else None
 
 
 # =========================
-# MG-ADL 문항(0~3)
+# 시트 헤더 (문항 정의는 mgadl_items.py)
 # =========================
-ITEMS = [
-    {"id": "mgadl_01_talking", "question": "말하기", "choices": {
-        0: "정상",
-        1: "때때로 불분명하거나 콧소리 나는 발음",
-        2: "불분명하거나 콧소리가 나는 발음이 지속되나 이해할 수 있음",
-        3: "말을 이해하기 어려움",
-    }},
-    {"id": "mgadl_02_chewing", "question": "씹기", "choices": {
-        0: "정상",
-        1: "고형 음식을 씹기가 어려움",
-        2: "부드러운 음식을 씹기가 어려움",
-        3: "위장 영양관",
-    }},
-    {"id": "mgadl_03_swallowing", "question": "삼키기", "choices": {
-        0: "정상",
-        1: "드물게 사래 들리는 경우가 있음",
-        2: "자주 사래 들려 식사에 변화를 줄 필요가 있음",
-        3: "위장 영양관",
-    }},
-    {"id": "mgadl_04_breathing", "question": "숨쉬기", "choices": {
-        0: "정상",
-        1: "힘든 활동 시 숨가쁨",
-        2: "휴식 시 숨가쁨",
-        3: "인공호흡기의존",
-    }},
-    {"id": "mgadl_05_brush_teeth_hair", "question": "양치나 머리를 빗을 때", "choices": {
-        0: "어려움 없음",
-        1: "힘이 더 들지만 쉬는 기간이 필요하지 않음",
-        2: "쉬는 기간이 필요함",
-        3: "이 기능 중 한 가지를 할 수 없음",
-    }},
-    {"id": "mgadl_06_arise_from_chair", "question": "의자에서 일어설 때", "choices": {
-        0: "어려움 없음",
-        1: "경증으로, 가끔 팔을 사용함",
-        2: "중등도로, 항상 팔을 사용함",
-        3: "중증으로, 도움이 필요함",
-    }},
-    {"id": "mgadl_07_diplopia", "question": "겹쳐보임(복시)", "choices": {
-        0: "없음",
-        1: "발생하나 매일 발생하지는 않음",
-        2: "매일 발생하나 지속적이지는 않음",
-        3: "지속적임",
-    }},
-    {"id": "mgadl_08_ptosis", "question": "눈꺼풀처짐(안검하수)", "choices": {
-        0: "없음",
-        1: "발생하나 매일 발생하지는 않음",
-        2: "매일 발생하나 지속적이지는 않음",
-        3: "지속적임",
-    }},
-]
-
 EXPECTED_HEADER = (
     ["created_at", "submission_id", "name", "dob", "patient_hash", "total_score"]
-    + [it["id"] for it in ITEMS]
+    + list(ITEM_IDS)
 )
+_HEADER_GETTER = itemgetter(*EXPECTED_HEADER)
 
 
 # =========================
 # 유틸
 # =========================
-def compute_total(responses: dict) -> int:
-    return int(sum(int(v) for v in responses.values()))
+def compute_total(responses: list) -> int:
+    # responses: ITEMS 순서의 int 점수 리스트
+    return sum(responses)
 
 
 def make_patient_hash(name: str, dob: str) -> str:
-    raw = f"{name}|{dob}|{SALT}".encode("utf-8")
+    # f"{name}|{dob}|{SALT}"와 같은 바이트열 -> 기존 patient_hash 값 유지
+    raw = _SEP.join((name.encode("utf-8"), dob.encode("utf-8"), _SALT_B))
     return hashlib.sha256(raw).hexdigest()[:16]
 
 
-def make_submission_id(patient_hash: str, created_at: str, responses: dict) -> str:
-    payload = json.dumps(responses, sort_keys=True, ensure_ascii=False)
-    raw = f"{patient_hash}|{created_at}|{payload}".encode("utf-8")
-    return hashlib.sha256(raw).hexdigest()[:16]
+def make_submission_id(patient_hash: str, created_at: str, responses: list) -> str:
+    # 점수(0~3)는 2비트 -> 문항 순서대로 하나의 정수에 패킹 (8문항 = 16비트)
+    packed = 0
+    for i, score in enumerate(responses):
+        packed |= (score & 3) << (2 * i)
+    raw = _SEP.join((patient_hash.encode("ascii"), created_at.encode("ascii"), b"%04x" % packed))
+    # 제출마다 새로 만드는 ID라 기존 값과 호환 불필요 -> BLAKE2b (16자리 hex 유지)
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+SHEETS_API = "https://sheets.googleapis.com/v4/spreadsheets"
+HTTP_TIMEOUT_SEC = 10  # Sheets API 호출 1건당 제한 (전송 스레드가 멈추지 않도록)
+
+
+TOKEN_REFRESH_SEC = 3300  # 액세스 토큰(1시간) 만료 5분 전에 미리 갱신
+
+
+def _schedule_token_refresh(creds):
+    timer = threading.Timer(TOKEN_REFRESH_SEC, _refresh_token, args=(creds,))
+    timer.daemon = True
+    timer.start()
+
+
+def _refresh_token(creds):
+    from google.auth.transport.requests import Request
+
+    try:
+        creds.refresh(Request())
+    except Exception:
+        pass  # 실패해도 요청 시점에 google-auth가 다시 갱신함
+    finally:
+        _schedule_token_refresh(creds)
 
 
 @st.cache_resource(show_spinner=False)
-def _get_gspread_client():
+def _get_credentials():
+    """gspread 클라이언트와 AuthorizedSession이 같은 creds를 공유"""
     if SA_INFO is None:
         raise RuntimeError("Secrets에 GOOGLE_SERVICE_ACCOUNT가 없습니다.")
+    from google.oauth2.service_account import Credentials
+
     scopes = ["https://www.googleapis.com/auth/spreadsheets"]
     creds = Credentials.from_service_account_info(SA_INFO, scopes=scopes)
-    return gspread.authorize(creds)
+    _schedule_token_refresh(creds)
+    return creds
+
+
+@st.cache_resource(show_spinner=False)
+def _get_gspread_client():
+    # 워크시트 탐색/헤더 확인용 (append는 _get_session으로 직접 호출)
+    import gspread
+
+    gc = gspread.authorize(_get_credentials())
+    gc.set_timeout(HTTP_TIMEOUT_SEC)
+    return gc
+
+
+@st.cache_resource(show_spinner=False)
+def _get_session():
+    # 같은 TCP/TLS 연결을 제출 간 재사용
+    from google.auth.transport.requests import AuthorizedSession
+
+    return AuthorizedSession(_get_credentials())
 
 
+@st.cache_resource(show_spinner=False)
 def get_worksheet():
     if not SHEET_ID:
         raise RuntimeError("Secrets에 SHEET_ID가 없습니다. (URL 말고 ID만)")
+    import gspread
+
     gc = _get_gspread_client()
     sh = gc.open_by_key(SHEET_ID)
     try:
@@ -120,47 +148,96 @@ def get_worksheet():
 
 
 def ensure_header(ws):
-    values = ws.get_all_values()
-    if len(values) == 0:
-        ws.append_row(EXPECTED_HEADER, value_input_option="RAW")
-        return EXPECTED_HEADER
+    """
+    1행만 읽어서 헤더 확인 (시트 전체를 읽지 않음).
+    비어 있으면 헤더 작성, 누락된 컬럼은 기존 헤더 뒤에만 추가.
+    """
+    from gspread.utils import rowcol_to_a1
 
     current = ws.row_values(1)
     if not current:
-        ws.update("1:1", [EXPECTED_HEADER])
+        ws.update("A1", [EXPECTED_HEADER], value_input_option="RAW")
         return EXPECTED_HEADER
 
     missing = [h for h in EXPECTED_HEADER if h not in current]
     if missing:
-        new_header = current + missing
-        ws.update("1:1", [new_header])
-        return new_header
+        start = rowcol_to_a1(1, len(current) + 1)
+        end = rowcol_to_a1(1, len(current) + len(missing))
+        ws.update(f"{start}:{end}", [missing], value_input_option="RAW")
+        return current + missing
 
     return current
 
 
-def append_record_to_sheet(record: dict):
+@st.cache_resource(show_spinner=False)
+def get_cached_header(_ws):
+    """
+    헤더 확인은 프로세스당 1회만 (_ws: 해싱 제외).
+    EXPECTED_HEADER는 ITEMS 수정(재배포) 때만 바뀌므로 이후 전송은 시트를 다시 읽지 않음.
+    """
+    return ensure_header(_ws)
+
+
+def _row_ranges(updated_range, n: int) -> list:
+    """예: 'responses'!A5:N7 -> 행별 범위 목록 (형식이 다르면 None)"""
+    m = re.fullmatch(r"(.*!)?([A-Z]+)(\d+):([A-Z]+)(\d+)", updated_range or "")
+    if not m or int(m[5]) - int(m[3]) + 1 != n:
+        return [None] * n
+    sheet, c1, r1, c2 = m[1] or "", m[2], int(m[3]), m[4]
+    return [f"{sheet}{c1}{r1 + i}:{c2}{r1 + i}" for i in range(n)]
+
+
+def append_records_to_sheet(records: list) -> list:
     """
     핵심: value_input_option='RAW' + 숫자값은 int로 넣어야
          구글시트에서 '정수(숫자)'로 저장됨.
+    여러 건을 values.append 1회로 전송. records 순서대로 건별 전송 정보 반환.
     """
     ws = get_worksheet()
-    header = ensure_header(ws)
+    header = ensure_header(ws) if FORCE_HEADER_CHECK else get_cached_header(ws)
 
-    row = [record.get(h, "") for h in header]
+    if header == EXPECTED_HEADER:
+        # build_record가 EXPECTED_HEADER 키를 모두 채우므로 바로 추출
+        rows = [list(_HEADER_GETTER(record)) for record in records]
+    else:
+        rows = [[record.get(h, "") for h in header] for record in records]
 
-    # RAW로 append (정수는 정수로 들어감)
-    res = ws.append_row(row, value_input_option="RAW")
-
-    updated_range = None
-    if isinstance(res, dict):
-        updated_range = res.get("updates", {}).get("updatedRange")
+    # RAW로 values.append 직접 호출 (정수는 정수로 들어감)
+    a1 = quote("'" + ws.title.replace("'", "''") + "'!A1", safe="")
+    try:
+        res = _get_session().post(
+            f"{SHEETS_API}/{SHEET_ID}/values/{a1}:append",
+            params={"valueInputOption": "RAW", "insertDataOption": "INSERT_ROWS"},
+            json={"values": rows},
+            timeout=HTTP_TIMEOUT_SEC,
+        )
+        if not res.ok:
+            # Google 오류 본문(error.message/status)을 그대로 보여줘야 설정/권한 문제를 알 수 있음
+            try:
+                detail = res.json().get("error", res.text)
+            except ValueError:
+                detail = res.text
+            raise RuntimeError(f"Sheets API {res.status_code}: {detail}")
+    except Exception:
+        # 시트가 바뀌었을 수 있으므로 다음 시도 때 워크시트/헤더를 다시 확인
+        get_cached_header.clear()
+        get_worksheet.clear()
+        raise
+
+    # 여기부터는 행이 이미 기록된 상태 -> 응답 파싱에 실패해도 전송 성공으로 처리
+    try:
+        updated_range = res.json().get("updates", {}).get("updatedRange")
+    except ValueError:
+        updated_range = None
 
-    return {
-        "spreadsheet_title": ws.spreadsheet.title,
-        "worksheet_title": ws.title,
-        "updated_range": updated_range,
-    }
+    return [
+        {
+            "spreadsheet_title": ws.spreadsheet.title,
+            "worksheet_title": ws.title,
+            "updated_range": row_range,
+        }
+        for row_range in _row_ranges(updated_range, len(rows))
+    ]
 
 
 def build_record():
@@ -168,8 +245,8 @@ def build_record():
     dob = st.session_state.patient["dob"]
     responses = st.session_state.responses
 
-    ph = make_patient_hash(name, dob)
-    total = compute_total(responses)
+    ph = st.session_state.patient_hash
+    total = st.session_state.total_score
 
     created_at = st.session_state.created_at
     submission_id = st.session_state.submission_id
@@ -181,70 +258,213 @@ def build_record():
         "name": name,
         "dob": dob,
         "patient_hash": ph,
-        "total_score": int(total),
+        "total_score": total,
     }
-    for it in ITEMS:
-        record[it["id"]] = int(responses.get(it["id"], 0))
+    # created_at/dob/이름/해시만 문자열, 나머지는 모두 int (RAW -> 숫자 셀)
+    record.update(zip(ITEM_IDS, responses))
     return record
 
 
+BATCH_MAX_ROWS = 50
+BATCH_WINDOW_SEC = 0.5
+SENT_IDS_MAX = 10000
+
+
+@st.cache_resource(show_spinner=False)
+def _sent_ids():
+    """최근 전송 완료된 submission_id -> 전송 정보 (프로세스 공용, 오래된 것부터 삭제)"""
+    return OrderedDict()
+
+
+def _send_batch(batch: list):
+    sent_ids = _sent_ids()
+
+    # 같은 submission_id는 1행만, 이전 배치에서 이미 기록된 것은 제외 (기록 시점 중복 방지)
+    records = {}
+    for submission_id, record, _ in batch:
+        if submission_id not in sent_ids:
+            records.setdefault(submission_id, record)
+
+    if records:
+        infos = append_records_to_sheet(list(records.values()))
+        for submission_id, info in zip(records, infos):
+            sent_ids[submission_id] = info
+        while len(sent_ids) > SENT_IDS_MAX:
+            sent_ids.popitem(last=False)
+
+    for submission_id, _, future in batch:
+        future.set_result(sent_ids.get(submission_id))
+
+
+def _drain_send_queue(q):
+    """
+    대기 중인 제출을 최대 BATCH_MAX_ROWS건 / BATCH_WINDOW_SEC초까지 모아서
+    append 1회로 전송 (쓰기 요청 quota 절약). 결과는 각 제출의 Future로 전달.
+    어떤 예외가 나도 스레드는 살아 있고, 아직 끝나지 않은 Future에 예외를 전달.
+    """
+    while True:
+        batch = [q.get()]
+        deadline = time.monotonic() + BATCH_WINDOW_SEC
+        while len(batch) < BATCH_MAX_ROWS:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(q.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        try:
+            _send_batch(batch)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+@st.cache_resource(show_spinner=False)
+def _send_queue():
+    q = queue.Queue()
+    threading.Thread(target=_drain_send_queue, args=(q,), daemon=True).start()
+    return q
+
+
+SEND_POLL_SEC = 0.3
+SEND_TIMEOUT_SEC = 60  # 이 시간 동안 결과가 없으면 실패 처리 -> 재시도 버튼 표시
+
+
 def try_send():
-    """중복 방지: 같은 submission_id는 1번만 전송(sent=True이면 재전송 안 함)"""
-    if st.session_state.sent:
-        return True
-    info = append_record_to_sheet(build_record())
-    st.session_state.sent = True
-    st.session_state.send_info = info
+    """
+    중복 방지: 같은 submission_id는 1번만 전송
+    (sent=True이거나 이미 전송 중이면 재전송 안 함).
+    전송은 백그라운드 큐에서 묶어서 진행 -> 결과는 poll_send()로 반영.
+    """
+    if st.session_state.sent or st.session_state.send_future is not None:
+        return
+    pending = st.session_state.send_pending
+    st.session_state.send_pending = None
+    if pending is not None and (not pending.done() or pending.exception() is None):
+        # 시간 초과됐던 전송이 아직 큐/전송 중(또는 늦게 성공) -> 같은 행을 또 넣지 않고 다시 기다림
+        st.session_state.send_error = None
+        st.session_state.send_future = pending
+        st.session_state.send_started = time.monotonic()
+        return
+    if st.session_state.submission_id in _sent_ids():
+        # 전송 중 연타 등 거의 동시에 들어온 동일 제출만 해당 (새 세션/재제출은 submission_id가 달라짐)
+        st.session_state.sent = True
+        st.session_state.send_info = None
+        st.session_state.send_error = None
+        st.session_state.step = 3
+        return
+    st.session_state.send_info = None
     st.session_state.send_error = None
+    future = Future()
+    _send_queue().put((st.session_state.submission_id, build_record(), future))
+    st.session_state.send_future = future
+    st.session_state.send_started = time.monotonic()
+
+
+def poll_send():
+    """백그라운드 전송이 끝났거나 SEND_TIMEOUT_SEC를 넘겼으면 결과를 세션에 반영하고 True 반환"""
+    future = st.session_state.send_future
+    if future is None:
+        return False
+    if not future.done():
+        if time.monotonic() - st.session_state.send_started < SEND_TIMEOUT_SEC:
+            return False
+        st.session_state.send_future = None
+        st.session_state.send_pending = future  # 재시도 때 다시 연결 (중복 행 방지)
+        st.session_state.send_error = repr(TimeoutError(f"{SEND_TIMEOUT_SEC}초 안에 전송 결과를 받지 못했습니다."))
+        return True
+    st.session_state.send_future = None
+    try:
+        st.session_state.send_info = future.result()
+    except Exception as e:
+        st.session_state.send_error = repr(e)
+    else:
+        st.session_state.sent = True
     return True
 
 
-# =========================
-# 세션 상태
-# =========================
-if "step" not in st.session_state:
-    st.session_state.step = 1  # 1: 비번+정보, 2: 설문, 3: 전송완료/결과
+def submit_survey():
+    """
+    설문 완료 버튼 콜백: 스크립트 실행 전에 응답 저장 + 전송 시작
+    -> 이어지는 1번의 rerun에서 바로 전송 상태가 그려짐 (st.rerun 불필요)
+    """
+    if st.session_state.send_future is not None:
+        # 전송 중 연타: 대기 중인 레코드와 세션의 submission_id가 어긋나지 않도록 무시
+        return
+    # 라디오 옵션이 점수(int)이므로 위젯 값이 곧 점수
+    new_responses = [st.session_state[it.radio_key] for it in ITEMS]
+    st.session_state.responses = new_responses
+    st.session_state.total_score = compute_total(new_responses)
 
-if "authed" not in st.session_state:
-    st.session_state.authed = False
+    created_at = datetime.now().isoformat(timespec="seconds")
+    st.session_state.created_at = created_at
 
-if "patient" not in st.session_state:
-    st.session_state.patient = {"name": "", "dob": ""}
+    st.session_state.submission_id = make_submission_id(
+        st.session_state.patient_hash, created_at, new_responses
+    )
 
-if "responses" not in st.session_state:
-    st.session_state.responses = {}
+    st.session_state.sent = False
+    st.session_state.send_pending = None  # 새 제출 -> 이전 submission_id의 대기 전송과 무관
+    try_send()
 
-if "created_at" not in st.session_state:
-    st.session_state.created_at = ""
 
-if "submission_id" not in st.session_state:
-    st.session_state.submission_id = ""
+@st.fragment(run_every=SEND_POLL_SEC)
+def send_status():
+    """전송 중일 때만 SEND_POLL_SEC마다 재실행, 완료되면 전체 rerun"""
+    if poll_send():
+        if st.session_state.sent:
+            st.session_state.step = 3
+        st.rerun()
+    st.info("전송 중입니다… (전송 완료 전에는 페이지가 넘어가지 않습니다)")
 
-if "sent" not in st.session_state:
-    st.session_state.sent = False
 
-if "send_info" not in st.session_state:
-    st.session_state.send_info = None
+# =========================
+# 세션 상태
+# =========================
+_DEFAULTS = (
+    ("step", 1),  # 1: 비번+정보, 2: 설문, 3: 전송완료/결과
+    ("authed", False),
+    ("patient", {"name": "", "dob": ""}),
+    ("patient_hash", ""),  # 이름/생년월일 확정 시 1회 계산
+    ("responses", [0] * len(ITEMS)),  # ITEMS 순서의 점수
+    ("total_score", 0),  # 설문 완료 시 1회 계산
+    ("created_at", ""),
+    ("submission_id", ""),
+    ("sent", False),
+    ("send_info", None),
+    ("send_error", None),
+    ("send_future", None),
+    ("send_started", 0.0),  # time.monotonic() 기준 전송 시작 시각
+    ("send_pending", None),  # 시간 초과됐지만 아직 끝나지 않은 전송의 Future
+)
 
-if "send_error" not in st.session_state:
-    st.session_state.send_error = None
+for k, v in _DEFAULTS:
+    if k not in st.session_state:
+        st.session_state[k] = copy.deepcopy(v)  # 최초 1회만 복사
 
 
 def reset_all():
-    st.session_state.step = 1
-    st.session_state.authed = False
-    st.session_state.patient = {"name": "", "dob": ""}
-    st.session_state.responses = {}
-    st.session_state.created_at = ""
-    st.session_state.submission_id = ""
-    st.session_state.sent = False
-    st.session_state.send_info = None
-    st.session_state.send_error = None
+    if st.session_state.send_future is not None:
+        return  # 전송 중에는 초기화하지 않음 (대기 중인 행의 결과를 잃지 않도록)
+    for k, v in _DEFAULTS:
+        st.session_state[k] = copy.deepcopy(v)
+
+
+def go_to(step: int):
+    """버튼 콜백: 단계 이동 (콜백 뒤 rerun은 Streamlit이 1번만 수행)"""
+    if st.session_state.send_future is not None:
+        return  # 전송 중에는 단계 이동 안 함 (결과는 2단계에서만 반영됨)
+    st.session_state.step = step
 
 
 # =========================
 # UI 공통
 # =========================
+sending = st.session_state.send_future is not None
+
 st.title("MG-ADL 설문지 - Vestibular LAB")
 st.caption("MG-ADL 설문지 온라인 웹 서비스입니다.")
 progress_map = {1: 33, 2: 66, 3: 100}
@@ -254,9 +474,7 @@ c1, c2 = st.columns([1, 1])
 with c1:
     st.write(f"현재 단계: **{st.session_state.step} / 3**")
 with c2:
-    if st.button("전체 초기화"):
-        reset_all()
-        st.rerun()
+    st.button("전체 초기화", on_click=reset_all, disabled=sending)
 
 st.divider()
 
@@ -281,9 +499,12 @@ if st.session_state.step == 1:
         submitted = st.form_submit_button("완료 (설문으로 이동)")
 
     if submitted:
-        if not APP_PASSWORD:
+        app_pw_hash = _app_pw_hash()
+        if app_pw_hash is None:
             st.error("서버 설정 오류: APP_PASSWORD가 Secrets에 설정되어 있지 않습니다.")
-        elif pw != APP_PASSWORD:
+        elif not hmac.compare_digest(
+            hashlib.blake2b(pw.encode("utf-8"), digest_size=16).digest(), app_pw_hash
+        ):
             st.error("비밀번호가 올바르지 않습니다.")
         elif not name.strip():
             st.error("이름을 입력해주세요.")
@@ -293,6 +514,9 @@ if st.session_state.step == 1:
             st.session_state.authed = True
             st.session_state.patient["name"] = name.strip()
             st.session_state.patient["dob"] = dob.isoformat()
+            st.session_state.patient_hash = make_patient_hash(
+                st.session_state.patient["name"], st.session_state.patient["dob"]
+            )
             st.session_state.step = 2
             st.rerun()
 
@@ -310,73 +534,32 @@ elif st.session_state.step == 2:
 
     st.write(f"대상자: **{st.session_state.patient['name']}** (DOB: {st.session_state.patient['dob']})")
 
+    if sending:
+        send_status()
+
     if st.session_state.send_error:
-        st.error("이전 전송이 실패했습니다.")
+        st.error("전송 실패: 설정/권한/시트 ID를 확인하세요.")
         st.code(st.session_state.send_error)
 
-    with st.form("survey_form"):
-        new_responses = {}
-        for item in ITEMS:
-            options = list(item["choices"].keys())
-            labels = [f"{k}점 - {item['choices'][k]}" for k in options]
-
-            prev = st.session_state.responses.get(item["id"], 0)
-            idx = options.index(int(prev)) if int(prev) in options else 0
-
-            selected = st.radio(
-                f"**{item['question']}**",
-                options=labels,
-                index=idx,
-                key=f"radio_{item['id']}",
+    with st.form("survey_form", clear_on_submit=False):
+        for item, prev in zip(ITEMS, st.session_state.responses):
+            st.radio(
+                f"**{item.question}**",
+                options=item.options,
+                index=item.index_of.get(prev, 0),
+                format_func=item.labels.__getitem__,
+                key=item.radio_key,
             )
-            score = int(selected.split("점")[0].strip())
-            new_responses[item["id"]] = score
-
-        submitted = st.form_submit_button("완료 (전송 후 결과 페이지로 이동)")
-
-    if submitted:
-        st.session_state.responses = new_responses
-
-        created_at = datetime.now().isoformat(timespec="seconds")
-        st.session_state.created_at = created_at
-
-        ph = make_patient_hash(st.session_state.patient["name"], st.session_state.patient["dob"])
-        st.session_state.submission_id = make_submission_id(ph, created_at, new_responses)
-
-        st.session_state.sent = False
-        st.session_state.send_info = None
-        st.session_state.send_error = None
 
-        with st.spinner("전송 중입니다… (전송 완료 전에는 페이지가 넘어가지 않습니다)"):
-            try:
-                try_send()
-                st.session_state.step = 3
-                st.rerun()
-            except Exception as e:
-                st.session_state.sent = False
-                st.session_state.send_info = None
-                st.session_state.send_error = repr(e)
-                st.error("전송 실패: 설정/권한/시트 ID를 확인하세요.")
-                st.code(st.session_state.send_error)
+        st.form_submit_button(
+            "완료 (전송 후 결과 페이지로 이동)", disabled=sending, on_click=submit_survey
+        )
 
     st.divider()
-    if st.button("이전 (정보 수정)"):
-        st.session_state.step = 1
-        st.rerun()
+    st.button("이전 (정보 수정)", on_click=go_to, args=(1,), disabled=sending)
 
-    if st.session_state.send_error and st.button("전송 재시도"):
-        with st.spinner("전송 재시도 중…"):
-            try:
-                st.session_state.sent = False
-                st.session_state.send_info = None
-                st.session_state.send_error = None
-                try_send()
-                st.session_state.step = 3
-                st.rerun()
-            except Exception as e:
-                st.session_state.send_error = repr(e)
-                st.error("재시도 전송 실패")
-                st.code(st.session_state.send_error)
+    if st.session_state.send_error:
+        st.button("전송 재시도", on_click=try_send)
 
 
 # =========================
@@ -390,8 +573,7 @@ else:
         st.session_state.step = 2
         st.rerun()
 
-    record = build_record()
-    total = int(record["total_score"])
+    total = st.session_state.total_score
 
     st.success("✅ 전송이 완료되었습니다. (중복 저장 방지 적용)")
 
@@ -406,19 +588,14 @@ else:
     st.metric("MG-ADL 총점", f"{total} / 24")
 
     rows = []
-    for item in ITEMS:
-        sc = int(st.session_state.responses.get(item["id"], 0))
-        rows.append({"문항": item["question"], "점수": sc, "선택": item["choices"][sc]})
-    st.dataframe(pd.DataFrame(rows), use_container_width=True)
+    for item, sc in zip(ITEMS, st.session_state.responses):
+        rows.append({"문항": item.question, "점수": sc, "선택": item.choices[sc]})
+    st.table(rows)
 
     st.divider()
     colA, colB = st.columns(2)
     with colA:
-        if st.button("이전 (설문 수정)"):
-            st.session_state.step = 2
-            st.rerun()
+        st.button("이전 (설문 수정)", on_click=go_to, args=(2,))
     with colB:
-        if st.button("새 설문 시작"):
-            reset_all()
-            st.rerun()
+        st.button("새 설문 시작", on_click=reset_all)
 
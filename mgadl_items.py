@@ -0,0 +1,89 @@
+# MG-ADL 문항 정의
+# 메인 스크립트(mgadl.py)는 rerun마다 다시 실행되지만, import된 이 모듈은
+# 프로세스당 1번만 실행됨 -> Item 클래스/라벨/index 맵을 매번 만들지 않음.
+from dataclasses import dataclass
+
+
+# =========================
+# MG-ADL 문항(0~3)
+# =========================
+_RAW_ITEMS = [
+    {"id": "mgadl_01_talking", "question": "말하기", "choices": {
+        0: "정상",
+        1: "때때로 불분명하거나 콧소리 나는 발음",
+        2: "불분명하거나 콧소리가 나는 발음이 지속되나 이해할 수 있음",
+        3: "말을 이해하기 어려움",
+    }},
+    {"id": "mgadl_02_chewing", "question": "씹기", "choices": {
+        0: "정상",
+        1: "고형 음식을 씹기가 어려움",
+        2: "부드러운 음식을 씹기가 어려움",
+        3: "위장 영양관",
+    }},
+    {"id": "mgadl_03_swallowing", "question": "삼키기", "choices": {
+        0: "정상",
+        1: "드물게 사래 들리는 경우가 있음",
+        2: "자주 사래 들려 식사에 변화를 줄 필요가 있음",
+        3: "위장 영양관",
+    }},
+    {"id": "mgadl_04_breathing", "question": "숨쉬기", "choices": {
+        0: "정상",
+        1: "힘든 활동 시 숨가쁨",
+        2: "휴식 시 숨가쁨",
+        3: "인공호흡기의존",
+    }},
+    {"id": "mgadl_05_brush_teeth_hair", "question": "양치나 머리를 빗을 때", "choices": {
+        0: "어려움 없음",
+        1: "힘이 더 들지만 쉬는 기간이 필요하지 않음",
+        2: "쉬는 기간이 필요함",
+        3: "이 기능 중 한 가지를 할 수 없음",
+    }},
+    {"id": "mgadl_06_arise_from_chair", "question": "의자에서 일어설 때", "choices": {
+        0: "어려움 없음",
+        1: "경증으로, 가끔 팔을 사용함",
+        2: "중등도로, 항상 팔을 사용함",
+        3: "중증으로, 도움이 필요함",
+    }},
+    {"id": "mgadl_07_diplopia", "question": "겹쳐보임(복시)", "choices": {
+        0: "없음",
+        1: "발생하나 매일 발생하지는 않음",
+        2: "매일 발생하나 지속적이지는 않음",
+        3: "지속적임",
+    }},
+    {"id": "mgadl_08_ptosis", "question": "눈꺼풀처짐(안검하수)", "choices": {
+        0: "없음",
+        1: "발생하나 매일 발생하지는 않음",
+        2: "매일 발생하나 지속적이지는 않음",
+        3: "지속적임",
+    }},
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Item:
+    id: str
+    question: str
+    choices: dict
+    options: tuple  # 라디오 옵션(점수)
+    labels: dict  # 점수 -> "0점 - 정상" 형태 라벨
+    index_of: dict  # 점수 -> 라디오 index
+    radio_key: str  # 설문 라디오 위젯 key
+
+
+def _make_item(raw: dict) -> Item:
+    # 라디오 옵션/라벨은 문항 정의에서 한 번만 생성
+    options = tuple(raw["choices"].keys())
+    return Item(
+        id=raw["id"],
+        question=raw["question"],
+        choices=raw["choices"],
+        options=options,
+        labels={k: f"{k}점 - {raw['choices'][k]}" for k in options},
+        index_of={k: i for i, k in enumerate(options)},
+        radio_key=f"radio_{raw['id']}",
+    )
+
+
+ITEMS = tuple(_make_item(raw) for raw in _RAW_ITEMS)
+
+ITEM_IDS = tuple(it.id for it in ITEMS)